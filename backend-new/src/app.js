@@ -31,11 +31,13 @@ app.use(cors({
   credentials: true
 }));
 
-// Compression middleware
-app.use(compression());
+// Compression middleware - skip tiny payloads where gzip overhead loses
+app.use(compression({ threshold: 512 }));
 
-// Logging middleware
-app.use(morgan('combined'));
+// Logging middleware - health probes fire constantly and only add noise
+app.use(morgan('combined', {
+  skip: (req) => req.path.startsWith('/api/health')
+}));
 app.use(requestLogger);
 
 // Body parsing middleware
@@ -89,15 +91,20 @@ async function startServer() {
   }
 }
 
-// Graceful shutdown
-process.on('SIGTERM', () => {
-  process.exit(0);
-});
+// Only boot services and bind the port when run directly - requiring the
+// app (tests, tooling) should not trigger service construction at import
+// time or spin up duplicate connection pools.
+if (require.main === module) {
+  // Graceful shutdown
+  process.on('SIGTERM', () => {
+    process.exit(0);
+  });
 
-process.on('SIGINT', () => {
-  process.exit(0);
-});
+  process.on('SIGINT', () => {
+    process.exit(0);
+  });
 
-startServer();
+  startServer();
+}
 
 module.exports = app;
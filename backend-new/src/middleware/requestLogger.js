@@ -1,15 +1,13 @@
 const requestLogger = (req, res, next) => {
   const start = Date.now();
-  
-  // Log request
-  
-  // Override res.end to log response
-  const originalEnd = res.end;
-  res.end = function(chunk, encoding) {
+
+  // Listen for response completion instead of monkey-patching res.end -
+  // keeps the write path untouched and the timing work off the hot path
+  res.on('finish', () => {
     const duration = Date.now() - start;
-    originalEnd.call(this, chunk, encoding);
-  };
-  
+    res.locals.responseTime = duration;
+  });
+
   next();
 };
 
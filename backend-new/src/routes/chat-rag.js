@@ -1,10 +1,15 @@
 const express = require('express');
 const { body, param, validationResult } = require('express-validator');
-const { v4: uuidv4 } = require('uuid');
+const { randomUUID } = require('crypto');
 const { getServices } = require('../services');
+const responseCache = require('../services/responseCache');
+const config = require('../config');
 
 const router = express.Router();
 
+// Compiled once at module load; shared by every request's sessionId check
+const UUID_V4_RE = /^[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}$/i;
+
 // Validation middleware
 const validateRequest = (req, res, next) => {
   const errors = validationResult(req);
@@ -18,10 +23,11 @@ const validateRequest = (req, res, next) => {
   next();
 };
 
-// Mock embedding generator (for testing without OpenAI API key)
+// Mock embedding generator (for testing without OpenAI API key) - sized to
+// the configured index dimension so mock vectors match real ones.
 function generateMockEmbedding(text) {
   const embedding = [];
-  for (let i = 0; i < 1024; i++) {
+  for (let i = 0; i < config.pinecone.dimension; i++) {
     // Generate random values between -1 and 1
     embedding.push(Math.random() * 2 - 1);
   }
@@ -32,7 +38,8 @@ function generateMockEmbedding(text) {
 async function generateRealEmbedding(text) {
   try {
     const services = getServices();
-    const embedding = await services.pineconeEmbeddings.getEmbedding(text);
+    // Batched variant coalesces concurrent chat turns into one API call
+    const embedding = await services.pineconeEmbeddings.getEmbeddingBatched(text);
     return embedding;
   } catch (error) {
     // Error generating real embedding, falling back to mock embedding
@@ -40,12 +47,50 @@ async function generateRealEmbedding(text) {
   }
 }
 
+// Static prompt sections, built once at module load - per-request work is
+// limited to splicing in the retrieved articles and recent conversation.
+const SYSTEM_PROMPT_HEADER = `You are a helpful AI assistant that answers questions based on news articles and current events. Use the provided context to give accurate and informative answers.
+
+`;
+
+const SYSTEM_PROMPT_INSTRUCTIONS = `Instructions:
+- Answer based on the provided news articles when available
+- If no relevant articles are found, provide a general helpful response
+- Be conversational and engaging
+- Cite specific articles when referencing information
+- If you don't know something, say so honestly`;
+
+// Greetings and other tiny queries gain nothing from retrieval - skip the
+// embedding and vector-search round-trips for them and let Gemini answer
+// without article context.
+const GREETINGS = new Set([
+  'hi', 'hello', 'hey', 'yo', 'thanks', 'thank you', 'ok', 'okay',
+  'bye', 'goodbye', 'good morning', 'good afternoon', 'good evening',
+  'how are you', "what's your name", 'who are you'
+]);
+
+// Upper bound on retrieved-article context fed into the prompt. Top-k
+// matches are admitted in score order until the budget is exhausted.
+const CONTEXT_TOKEN_BUDGET = 2000;
+
+const TRAILING_PUNCTUATION_RE = /[.!?\s]+$/;
+const WHITESPACE_RE = /\s+/;
+
+function needsRetrieval(message) {
+  // Normalize once, then a constant-time set probe
+  const normalized = message.toLowerCase().trim().replace(TRAILING_PUNCTUATION_RE, '');
+  if (GREETINGS.has(normalized)) {
+    return false;
+  }
+  return normalized.split(WHITESPACE_RE).length >= 3;
+}
+
 // POST /api/chat - Handle new chat queries with RAG
 router.post('/', [
   body('message').notEmpty().withMessage('Message is required'),
   body('sessionId').optional().custom((value) => {
     if (value === null || value === undefined) return true;
-    return /^[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}$/i.test(value);
+    return UUID_V4_RE.test(value);
   }).withMessage('Session ID must be a valid UUID or null'),
   body('stream').optional().isBoolean().withMessage('Stream must be a boolean')
 ], validateRequest, async (req, res) => {
@@ -54,50 +99,135 @@ router.post('/', [
     const services = getServices();
     
     // Generate session ID if not provided
-    const currentSessionId = sessionId || uuidv4();
+    const currentSessionId = sessionId || randomUUID();
     
     
     // Add user message to session (if Redis is available)
     const userMessage = {
-      id: uuidv4(),
+      id: randomUUID(),
       text: message,
       sender: 'user',
       timestamp: new Date().toISOString()
     };
     
-    if (services.redis) {
-      await services.redis.addMessageToSession(currentSessionId, userMessage);
-    } else {
-      // Redis not available - session not persisted
+    // Persisting the user message and embedding the query are independent
+    // network calls - run them concurrently instead of serializing them.
+    const userMessageWrite = services.redis
+      ? services.redis.addMessageToSession(currentSessionId, userMessage)
+      : Promise.resolve(); // Redis not available - session not persisted
+
+    // Generate query embedding using real OpenAI API - unless this is a
+    // greeting/trivial query that retrieval cannot help with
+    const retrievalNeeded = needsRetrieval(message);
+    const [, queryEmbedding] = await Promise.all([
+      userMessageWrite,
+      retrievalNeeded ? generateRealEmbedding(message) : Promise.resolve(null)
+    ]);
+
+    // Probe the semantic response cache before paying for retrieval and
+    // generation - a near-duplicate query reuses the stored answer.
+    const cachedResponse = queryEmbedding ? responseCache.lookup(queryEmbedding) : null;
+    if (cachedResponse !== null) {
+      const cachedMessage = {
+        id: randomUUID(),
+        text: cachedResponse,
+        sender: 'assistant',
+        timestamp: new Date().toISOString(),
+        metadata: {
+          searchResults: 0,
+          hasContext: false,
+          cached: true
+        }
+      };
+
+      // Persist after responding - the client doesn't need to wait on it
+      if (services.redis) {
+        services.redis.addMessageToSession(currentSessionId, cachedMessage).catch(() => {});
+      }
+
+      // Streaming clients expect SSE frames even on a cache hit - send the
+      // whole cached answer as one delta followed by the done frame.
+      if (stream) {
+        res.setHeader('Content-Type', 'text/event-stream');
+        res.setHeader('Cache-Control', 'no-cache, no-transform');
+        res.setHeader('Connection', 'keep-alive');
+        res.flushHeaders();
+        res.write(`data: ${JSON.stringify({ type: 'delta', text: cachedResponse })}\n\n`);
+        res.write(`data: ${JSON.stringify({
+          type: 'done',
+          sessionId: currentSessionId,
+          timestamp: cachedMessage.timestamp,
+          metadata: cachedMessage.metadata
+        })}\n\n`);
+        return res.end();
+      }
+
+      return res.json({
+        success: true,
+        data: {
+          sessionId: currentSessionId,
+          message: cachedResponse,
+          timestamp: cachedMessage.timestamp,
+          metadata: {
+            searchResults: 0,
+            hasContext: false,
+            cached: true,
+            articles: []
+          }
+        }
+      });
     }
-    
-    // Generate query embedding using real OpenAI API
-    const queryEmbedding = await generateRealEmbedding(message);
-    
+
     // Search for relevant content in Pinecone
     let relevantContext = '';
     let searchResults = [];
-    
-    try {
-      searchResults = await services.pinecone.queryVectors(queryEmbedding, 5);
-      
-      if (searchResults.matches && searchResults.matches.length > 0) {
-        
-        // Build context from search results
-        relevantContext = searchResults.matches.map((match, index) => {
-          return `Article ${index + 1}: ${match.metadata.title}\n${match.metadata.content}`;
-        }).join('\n\n');
-        
-      } else {
-        // No relevant articles found in Pinecone
+
+    // The vector search and the chat-history fetch are independent - start
+    // the history read now and await it once retrieval is done. Only the
+    // last 3 exchanges are needed for conversation context.
+    const historyFetch = services.redis
+      ? services.redis.getRecentMessages(currentSessionId, 6)
+      : Promise.resolve([]);
+
+    if (queryEmbedding) {
+      try {
+        searchResults = await services.pinecone.queryVectors(queryEmbedding, 5);
+
+        if (searchResults.matches && searchResults.matches.length > 0) {
+
+          // Build context from search results under a fixed token budget.
+          // Matches arrive ordered by score, so the best articles always
+          // make the cut; lower-ranked ones are dropped once the budget is
+          // spent and exact-duplicate chunks are skipped outright. This
+          // bounds prompt size (and generation cost) on content-heavy hits.
+          const contextParts = [];
+          const seenContent = new Set();
+          let contextTokens = 0;
+          for (const match of searchResults.matches) {
+            if (seenContent.has(match.metadata.content)) {
+              continue;
+            }
+            const part = `Article ${contextParts.length + 1}: ${match.metadata.title}\n${match.metadata.content}`;
+            const partTokens = services.pinecone.estimateTokens(part);
+            if (contextTokens + partTokens > CONTEXT_TOKEN_BUDGET && contextParts.length > 0) {
+              break;
+            }
+            seenContent.add(match.metadata.content);
+            contextParts.push(part);
+            contextTokens += partTokens;
+          }
+          relevantContext = contextParts.join('\n\n');
+
+        } else {
+          // No relevant articles found in Pinecone
+        }
+      } catch (error) {
+        // Continue without context
       }
-    } catch (error) {
-      // Continue without context
     }
     
-    // Get chat history for context (if Redis is available)
-    const chatHistory = services.redis ? await services.redis.getSessionHistory(currentSessionId) : [];
-    const recentHistory = chatHistory.slice(-6); // Last 3 exchanges
+    // Get recent chat history for context (if Redis is available)
+    const recentHistory = await historyFetch;
     
     // Build conversation context
     let conversationContext = '';
@@ -108,45 +238,107 @@ router.post('/', [
     }
     
     // Generate response using Gemini with RAG context
-    let response;
-    try {
-      const systemPrompt = `You are a helpful AI assistant that answers questions based on news articles and current events. Use the provided context to give accurate and informative answers.
+    const systemPrompt = SYSTEM_PROMPT_HEADER +
+      (relevantContext ? `Relevant News Articles:\n${relevantContext}\n\n` : '') +
+      (conversationContext ? `Recent Conversation:\n${conversationContext}\n\n` : '') +
+      SYSTEM_PROMPT_INSTRUCTIONS;
 
-${relevantContext ? `Relevant News Articles:
-${relevantContext}
+    // Streamed variant: emit token deltas over SSE as Gemini produces them,
+    // so time-to-first-token is ~TTFT instead of the full generation time.
+    if (stream) {
+      res.setHeader('Content-Type', 'text/event-stream');
+      // no-transform keeps the compression middleware from buffering deltas
+      res.setHeader('Cache-Control', 'no-cache, no-transform');
+      res.setHeader('Connection', 'keep-alive');
+      res.flushHeaders();
 
-` : ''}${conversationContext ? `Recent Conversation:
-${conversationContext}
+      let fullResponse = '';
+      let streamFailed = false;
 
-` : ''}Instructions:
-- Answer based on the provided news articles when available
-- If no relevant articles are found, provide a general helpful response
-- Be conversational and engaging
-- Cite specific articles when referencing information
-- If you don't know something, say so honestly`;
+      try {
+        const geminiStream = await services.gemini.generateStreamingResponse(message, systemPrompt);
+        for await (const chunk of geminiStream) {
+          const delta = chunk.text();
+          if (delta) {
+            fullResponse += delta;
+            res.write(`data: ${JSON.stringify({ type: 'delta', text: delta })}\n\n`);
+          }
+        }
+      } catch (error) {
+        streamFailed = true;
+        if (!fullResponse) {
+          fullResponse = "I'm sorry, I'm having trouble generating a response right now. Please try again later.";
+        }
+        res.write(`data: ${JSON.stringify({ type: 'error', message: 'Response generation was interrupted' })}\n\n`);
+      }
+
+      if (!streamFailed && queryEmbedding) {
+        responseCache.store(queryEmbedding, fullResponse);
+      }
+
+      const streamedMessage = {
+        id: randomUUID(),
+        text: fullResponse,
+        sender: 'assistant',
+        timestamp: new Date().toISOString(),
+        metadata: {
+          searchResults: searchResults.matches?.length || 0,
+          hasContext: !!relevantContext
+        }
+      };
+
+      // Persist in the background - the stream is already complete
+      if (services.redis) {
+        services.redis.addMessageToSession(currentSessionId, streamedMessage).catch(() => {});
+      }
+
+      res.write(`data: ${JSON.stringify({
+        type: 'done',
+        sessionId: currentSessionId,
+        timestamp: streamedMessage.timestamp,
+        metadata: streamedMessage.metadata
+      })}\n\n`);
+      return res.end();
+    }
 
+    let response;
+    try {
       response = await services.gemini.generateResponse(message, systemPrompt);
+
+      // Only cache real answers, never the fallback error message.
+      if (queryEmbedding) {
+        responseCache.store(queryEmbedding, response);
+      }
     } catch (error) {
       response = "I'm sorry, I'm having trouble generating a response right now. Please try again later.";
     }
     
+    // Derive the retrieval summary once - the session record and the
+    // response body both report the same counts and article list.
+    const matchCount = searchResults.matches?.length || 0;
+    const articles = searchResults.matches?.map(match => ({
+      title: match.metadata.title,
+      score: match.score
+    })) || [];
+
     // Add AI response to session
     const aiMessage = {
-      id: uuidv4(),
+      id: randomUUID(),
       text: response,
       sender: 'assistant',
       timestamp: new Date().toISOString(),
       metadata: {
-        searchResults: searchResults.matches?.length || 0,
+        searchResults: matchCount,
         hasContext: !!relevantContext
       }
     };
-    
-    // Store AI response in session (if Redis is available)
+
+    // Store AI response in session (if Redis is available) - fire and
+    // forget so the client isn't held up by session bookkeeping
     if (services.redis) {
-      await services.redis.addMessageToSession(currentSessionId, aiMessage);
+      services.redis.addMessageToSession(currentSessionId, aiMessage).catch(() => {});
     }
-    
+
     // Return response
     res.json({
       success: true,
@@ -155,12 +347,9 @@ ${conversationContext}
         message: response,
         timestamp: aiMessage.timestamp,
         metadata: {
-          searchResults: searchResults.matches?.length || 0,
+          searchResults: matchCount,
           hasContext: !!relevantContext,
-          articles: searchResults.matches?.map(match => ({
-            title: match.metadata.title,
-            score: match.score
-          })) || []
+          articles
         }
       }
     });
@@ -174,6 +363,46 @@ ${conversationContext}
   }
 });
 
+// POST /api/chat/batch - Retrieve relevant articles for several messages at once
+router.post('/batch', [
+  body('messages').isArray({ min: 1, max: 32 }).withMessage('Messages must be a non-empty array (max 32)'),
+  body('messages.*').isString().notEmpty().withMessage('Each message must be a non-empty string')
+], validateRequest, async (req, res) => {
+  try {
+    const { messages } = req.body;
+    const services = getServices();
+
+    // One embedding round-trip for the whole batch, then retrieval fans out
+    const embeddings = await services.pineconeEmbeddings.getEmbeddings(messages);
+    const searches = await Promise.all(
+      embeddings.map(embedding =>
+        services.pinecone.queryVectors(embedding, 5).catch(() => ({ matches: [] }))
+      )
+    );
+
+    const results = messages.map((message, i) => ({
+      message,
+      articles: searches[i].matches?.map(match => ({
+        title: match.metadata.title,
+        content: match.metadata.content,
+        score: match.score
+      })) || []
+    }));
+
+    res.json({
+      success: true,
+      data: { results }
+    });
+
+  } catch (error) {
+    res.status(500).json({
+      success: false,
+      error: 'Failed to process batch query',
+      message: error.message
+    });
+  }
+});
+
 // GET /api/chat/history/:sessionId - Get chat history for a session
 router.get('/history/:sessionId', [
   param('sessionId').isUUID().withMessage('Session ID must be a valid UUID')
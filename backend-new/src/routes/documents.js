@@ -1,26 +1,16 @@
 const express = require('express');
 const multer = require('multer');
 const { body, validationResult } = require('express-validator');
-const { v4: uuidv4 } = require('uuid');
+const { randomUUID } = require('crypto');
 const { getServices } = require('../services');
-const fs = require('fs').promises;
-const path = require('path');
 
 const router = express.Router();
 
-// Configure multer for file uploads
-const storage = multer.diskStorage({
-  destination: (req, file, cb) => {
-    cb(null, 'uploads/');
-  },
-  filename: (req, file, cb) => {
-    const uniqueSuffix = Date.now() + '-' + Math.round(Math.random() * 1E9);
-    cb(null, file.fieldname + '-' + uniqueSuffix + path.extname(file.originalname));
-  }
-});
-
-const upload = multer({ 
-  storage: storage,
+// Keep uploads in memory and process the buffer directly - documents are
+// capped at 10MB, so the temp-file round-trip (write, read back, unlink)
+// was pure overhead on the upload path.
+const upload = multer({
+  storage: multer.memoryStorage(),
   limits: {
     fileSize: 10 * 1024 * 1024 // 10MB limit
   },
@@ -57,60 +47,29 @@ const validateRequest = (req, res, next) => {
 };
 
 // Function to extract text from different file types
-async function extractTextFromFile(filePath, mimetype) {
+function extractTextFromBuffer(buffer, fileName, mimetype) {
   try {
     if (mimetype === 'text/plain' || mimetype === 'text/markdown') {
-      return await fs.readFile(filePath, 'utf8');
+      return buffer.toString('utf8');
     } else if (mimetype === 'application/json') {
-      const content = await fs.readFile(filePath, 'utf8');
-      const jsonData = JSON.parse(content);
+      const jsonData = JSON.parse(buffer.toString('utf8'));
       return JSON.stringify(jsonData, null, 2);
     } else if (mimetype === 'application/pdf') {
       // For PDF, you would need a PDF parser like pdf-parse
       // For now, return a placeholder
-      return `[PDF content from ${path.basename(filePath)} - PDF parsing not implemented yet]`;
+      return `[PDF content from ${fileName} - PDF parsing not implemented yet]`;
     } else if (mimetype.includes('word')) {
       // For Word documents, you would need a Word parser
       // For now, return a placeholder
-      return `[Word document content from ${path.basename(filePath)} - Word parsing not implemented yet]`;
+      return `[Word document content from ${fileName} - Word parsing not implemented yet]`;
     }
-    
-    return await fs.readFile(filePath, 'utf8');
+
+    return buffer.toString('utf8');
   } catch (error) {
     throw error;
   }
 }
 
-// Function to chunk text
-function chunkText(text, chunkSize = 1000, overlap = 200) {
-  const chunks = [];
-  let start = 0;
-  
-  while (start < text.length) {
-    const end = Math.min(start + chunkSize, text.length);
-    let chunk = text.slice(start, end);
-    
-    // Try to break at word boundary
-    if (end < text.length) {
-      const lastSpace = chunk.lastIndexOf(' ');
-      if (lastSpace > chunkSize * 0.8) {
-        chunk = chunk.slice(0, lastSpace);
-        start += lastSpace + 1;
-      } else {
-        start += chunkSize - overlap;
-      }
-    } else {
-      start = text.length;
-    }
-    
-    if (chunk.trim().length > 0) {
-      chunks.push(chunk.trim());
-    }
-  }
-  
-  return chunks;
-}
-
 // POST /api/documents/upload - Upload and process documents
 router.post('/upload', upload.single('document'), async (req, res) => {
   try {
@@ -122,18 +81,15 @@ router.post('/upload', upload.single('document'), async (req, res) => {
     }
 
     const services = getServices();
-    const filePath = req.file.path;
     const fileName = req.file.originalname;
     const fileSize = req.file.size;
     const mimetype = req.file.mimetype;
 
 
-    // Extract text from file
-    const textContent = await extractTextFromFile(filePath, mimetype);
-    
+    // Extract text straight from the upload buffer
+    const textContent = extractTextFromBuffer(req.file.buffer, fileName, mimetype);
+
     if (!textContent || textContent.trim().length < 100) {
-      // Clean up file
-      await fs.unlink(filePath);
       return res.status(400).json({
         success: false,
         error: 'Document content too short or empty'
@@ -141,7 +97,7 @@ router.post('/upload', upload.single('document'), async (req, res) => {
     }
 
     // Create document metadata
-    const documentId = uuidv4();
+    const documentId = randomUUID();
     const documentData = {
       id: documentId,
       title: fileName,
@@ -153,39 +109,43 @@ router.post('/upload', upload.single('document'), async (req, res) => {
       category: req.body.category || 'general'
     };
 
-    // Chunk the document
-    const chunks = chunkText(textContent, 1000, 200);
+    // Chunk the document (250-token chunks with 50-token overlap, the same
+    // 1000/200-char split as before expressed in token units)
+    const chunks = services.pinecone.chunkTextByTokens(textContent, 250, 50);
 
     // Generate embeddings for chunks
     const embeddings = await services.pineconeEmbeddings.getBatchEmbeddings(chunks);
 
+    // Document-level fields are shared by every chunk - build them once and
+    // spread, so per-chunk work is only the content and index.
+    const baseMetadata = {
+      documentId: documentId,
+      title: fileName,
+      fullContent: textContent,
+      fileName: fileName,
+      fileSize: fileSize,
+      mimetype: mimetype,
+      uploadedAt: documentData.uploadedAt,
+      category: documentData.category,
+      totalChunks: chunks.length,
+      type: 'document',
+      created_at: new Date().toISOString()
+    };
+
     // Create vectors for Pinecone
     const vectors = chunks.map((chunk, index) => ({
       id: `${documentId}_chunk_${index}`,
       values: embeddings[index],
       metadata: {
-        documentId: documentId,
-        title: fileName,
+        ...baseMetadata,
         content: chunk,
-        fullContent: textContent,
-        fileName: fileName,
-        fileSize: fileSize,
-        mimetype: mimetype,
-        uploadedAt: documentData.uploadedAt,
-        category: documentData.category,
-        chunkIndex: index,
-        totalChunks: chunks.length,
-        type: 'document',
-        created_at: new Date().toISOString()
+        chunkIndex: index
       }
     }));
 
     // Upload to Pinecone
     await services.pinecone.upsertVectors(vectors);
 
-    // Clean up uploaded file
-    await fs.unlink(filePath);
-
     res.json({
       success: true,
       message: `Document "${fileName}" processed and uploaded successfully`,
@@ -201,15 +161,6 @@ router.post('/upload', upload.single('document'), async (req, res) => {
     });
 
   } catch (error) {
-    
-    // Clean up file if it exists
-    if (req.file && req.file.path) {
-      try {
-        await fs.unlink(req.file.path);
-      } catch (cleanupError) {
-      }
-    }
-
     res.status(500).json({
       success: false,
       error: 'Failed to process document',
@@ -237,7 +188,7 @@ router.post('/text', [
     }
 
     // Create document metadata
-    const documentId = uuidv4();
+    const documentId = randomUUID();
     const documentData = {
       id: documentId,
       title: title,
@@ -246,27 +197,34 @@ router.post('/text', [
       category: category
     };
 
-    // Chunk the content
-    const chunks = chunkText(content, 1000, 200);
+    // Chunk the content (250-token chunks with 50-token overlap, the same
+    // 1000/200-char split as before expressed in token units)
+    const chunks = services.pinecone.chunkTextByTokens(content, 250, 50);
 
     // Generate embeddings for chunks
     const embeddings = await services.pineconeEmbeddings.getBatchEmbeddings(chunks);
 
+    // Document-level fields are shared by every chunk - build them once and
+    // spread, so per-chunk work is only the content and index.
+    const baseMetadata = {
+      documentId: documentId,
+      title: title,
+      fullContent: content,
+      uploadedAt: documentData.uploadedAt,
+      category: category,
+      totalChunks: chunks.length,
+      type: 'text_document',
+      created_at: new Date().toISOString()
+    };
+
     // Create vectors for Pinecone
     const vectors = chunks.map((chunk, index) => ({
       id: `${documentId}_chunk_${index}`,
       values: embeddings[index],
       metadata: {
-        documentId: documentId,
-        title: title,
+        ...baseMetadata,
         content: chunk,
-        fullContent: content,
-        uploadedAt: documentData.uploadedAt,
-        category: category,
-        chunkIndex: index,
-        totalChunks: chunks.length,
-        type: 'text_document',
-        created_at: new Date().toISOString()
+        chunkIndex: index
       }
     }));
 
@@ -1,7 +1,8 @@
 const express = require('express');
 const { body, query, param, validationResult } = require('express-validator');
-const { v4: uuidv4 } = require('uuid');
+const { randomUUID } = require('crypto');
 const { getServices } = require('../services');
+const config = require('../config');
 
 const router = express.Router();
 
@@ -18,44 +19,16 @@ const validateRequest = (req, res, next) => {
   next();
 };
 
-// Mock embedding generator
+// Mock embedding generator - sized to the configured index dimension so
+// mock vectors match real ones.
 function generateMockEmbedding(text) {
   const embedding = [];
-  for (let i = 0; i < 1024; i++) {
+  for (let i = 0; i < config.pinecone.dimension; i++) {
     embedding.push(Math.random() * 2 - 1);
   }
   return embedding;
 }
 
-// Function to chunk text
-function chunkText(text, chunkSize = 500, overlap = 50) {
-  const chunks = [];
-  let start = 0;
-  
-  while (start < text.length) {
-    const end = Math.min(start + chunkSize, text.length);
-    let chunk = text.slice(start, end);
-    
-    if (end < text.length) {
-      const lastSpace = chunk.lastIndexOf(' ');
-      if (lastSpace > chunkSize * 0.8) {
-        chunk = chunk.slice(0, lastSpace);
-        start += lastSpace + 1;
-      } else {
-        start += chunkSize - overlap;
-      }
-    } else {
-      start = text.length;
-    }
-    
-    if (chunk.trim().length > 0) {
-      chunks.push(chunk.trim());
-    }
-  }
-  
-  return chunks;
-}
-
 // POST /api/news/upload - Upload news articles to vector database
 router.post('/upload', [
   body('articles').isArray().withMessage('Articles must be an array'),
@@ -75,49 +48,59 @@ router.post('/upload', [
     for (let i = 0; i < articles.length; i++) {
       const article = articles[i];
       
-      // Chunk the article content
-      const chunks = chunkText(article.content);
-      
+      // Chunk the article content (125-token chunks; the fractional overlap
+      // keeps the previous 50-char overlap exactly)
+      const chunks = services.pinecone.chunkTextByTokens(article.content, 125, 12.5);
+
+      // Per-article fields are identical across its chunks - build them once
+      // and spread, so each chunk only adds its own content and index.
+      const baseMetadata = {
+        title: article.title,
+        fullContent: article.content,
+        url: article.url || '',
+        publishedAt: article.publishedAt || new Date().toISOString(),
+        totalChunks: chunks.length,
+        type: 'news_article',
+        created_at: new Date().toISOString()
+      };
+
       // Create vectors for each chunk
       for (let j = 0; j < chunks.length; j++) {
         const chunk = chunks[j];
         const embedding = generateMockEmbedding(chunk);
-        
-        const vector = {
-          id: uuidv4(),
+
+        allVectors.push({
+          id: randomUUID(),
           values: embedding,
           metadata: {
-            title: article.title,
+            ...baseMetadata,
             content: chunk,
-            fullContent: article.content,
-            url: article.url || '',
-            publishedAt: article.publishedAt || new Date().toISOString(),
-            chunkIndex: j,
-            totalChunks: chunks.length,
-            type: 'news_article',
-            created_at: new Date().toISOString()
+            chunkIndex: j
           }
-        };
-        
-        allVectors.push(vector);
+        });
       }
     }
     
     
     // Upload to Pinecone in batches
     const batchSize = 100;
-    let uploadedCount = 0;
-    
+    const batches = [];
     for (let i = 0; i < allVectors.length; i += batchSize) {
-      const batch = allVectors.slice(i, i + batchSize);
-      
-      try {
-        await services.pinecone.upsertVectors(batch);
-        uploadedCount += batch.length;
-      } catch (error) {
-        // Continue with next batch
-      }
+      batches.push(allVectors.slice(i, i + batchSize));
     }
+
+    // Upsert batches concurrently - one slow or failing batch no longer
+    // stalls the rest; failed batches are simply not counted.
+    const results = await Promise.allSettled(
+      batches.map(batch => services.pinecone.upsertVectors(batch))
+    );
+
+    let uploadedCount = 0;
+    results.forEach((result, i) => {
+      if (result.status === 'fulfilled') {
+        uploadedCount += batches[i].length;
+      }
+    });
     
     res.json({
       success: true,
@@ -225,14 +208,10 @@ router.get('/:id', [
     const { id } = req.params;
     const services = getServices();
     
-    // Search for the specific article by ID
-    const searchResults = await services.pinecone.queryVectors(
-      generateMockEmbedding(''), // Empty query to get all
-      1000 // Large limit to find the specific article
-    );
-    
-    const article = searchResults.matches?.find(match => match.id === id);
-    
+    // Fetch the article directly by ID instead of scanning the index
+    const fetchResult = await services.pinecone.fetchVectors([id]);
+    const article = fetchResult.records?.[id];
+
     if (!article) {
       return res.status(404).json({
         success: false,
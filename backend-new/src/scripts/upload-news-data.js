@@ -1,5 +1,6 @@
 const { initializeServices, getServices } = require('../services');
-const { v4: uuidv4 } = require('uuid');
+const { randomUUID } = require('crypto');
+const config = require('../config');
 const axios = require('axios');
 const cheerio = require('cheerio');
 
@@ -67,46 +68,17 @@ const newsArticles = [
   }
 ];
 
-// Mock embedding generator (creates random 1024-dimensional vectors)
+// Mock embedding generator - sized to the configured index dimension so
+// mock vectors match real ones.
 function generateMockEmbedding(text) {
   const embedding = [];
-  for (let i = 0; i < 1024; i++) {
+  for (let i = 0; i < config.pinecone.dimension; i++) {
     // Generate random values between -1 and 1
     embedding.push(Math.random() * 2 - 1);
   }
   return embedding;
 }
 
-// Function to chunk text into smaller pieces
-function chunkText(text, chunkSize = 500, overlap = 50) {
-  const chunks = [];
-  let start = 0;
-  
-  while (start < text.length) {
-    const end = Math.min(start + chunkSize, text.length);
-    let chunk = text.slice(start, end);
-    
-    // Try to break at word boundary
-    if (end < text.length) {
-      const lastSpace = chunk.lastIndexOf(' ');
-      if (lastSpace > chunkSize * 0.8) {
-        chunk = chunk.slice(0, lastSpace);
-        start += lastSpace + 1;
-      } else {
-        start += chunkSize - overlap;
-      }
-    } else {
-      start = text.length;
-    }
-    
-    if (chunk.trim().length > 0) {
-      chunks.push(chunk.trim());
-    }
-  }
-  
-  return chunks;
-}
-
 async function uploadNewsData() {
   try {
     
@@ -122,64 +94,66 @@ async function uploadNewsData() {
     for (let i = 0; i < newsArticles.length; i++) {
       const article = newsArticles[i];
       
-      // Chunk the article content
-      const chunks = chunkText(article.content);
-      
+      // Chunk the article content (125-token chunks; the fractional overlap
+      // keeps the previous 50-char overlap exactly)
+      const chunks = services.pinecone.chunkTextByTokens(article.content, 125, 12.5);
+
+      // Per-article fields are identical across its chunks - build them once
+      // and spread, so each chunk only adds its own content and index.
+      const baseMetadata = {
+        title: article.title,
+        fullContent: article.content,
+        url: article.url,
+        publishedAt: article.publishedAt,
+        totalChunks: chunks.length,
+        type: 'news_article',
+        created_at: new Date().toISOString()
+      };
+
       // Create vectors for each chunk
       for (let j = 0; j < chunks.length; j++) {
         const chunk = chunks[j];
         const embedding = generateMockEmbedding(chunk);
-        
-        const vector = {
-          id: uuidv4(),
+
+        allVectors.push({
+          id: randomUUID(),
           values: embedding,
           metadata: {
-            title: article.title,
+            ...baseMetadata,
             content: chunk,
-            fullContent: article.content,
-            url: article.url,
-            publishedAt: article.publishedAt,
-            chunkIndex: j,
-            totalChunks: chunks.length,
-            type: 'news_article',
-            created_at: new Date().toISOString()
+            chunkIndex: j
           }
-        };
-        
-        allVectors.push(vector);
+        });
       }
     }
     
     
-    // Upload to Pinecone in batches
+    // Upload to Pinecone with all batches in flight at once - batches are
+    // independent, so total upload time is the slowest batch, not the sum.
+    // allSettled keeps the old behavior of continuing past a failed batch.
     const batchSize = 100;
+    const batches = [];
     for (let i = 0; i < allVectors.length; i += batchSize) {
-      const batch = allVectors.slice(i, i + batchSize);
-      
-      try {
-        const result = await services.pinecone.upsertVectors(batch);
-      } catch (error) {
-        // Continue with next batch
-      }
-    }
-    
-    
-    // Verify upload
-    try {
-      const stats = await services.pinecone.getIndexStats();
-    } catch (error) {
+      batches.push(allVectors.slice(i, i + batchSize));
     }
-    
-    // Test search
+    await Promise.allSettled(
+      batches.map(batch => services.pinecone.upsertVectors(batch))
+    );
+
+
+    // Verify upload: the stats probe and the test search are independent
+    // round-trips, so run them concurrently instead of back to back.
     const testQuery = "What is artificial intelligence?";
     const testEmbedding = generateMockEmbedding(testQuery);
-    
-    try {
-      const searchResults = await services.pinecone.queryVectors(testEmbedding, 3);
-      
-      searchResults.matches?.forEach((match, index) => {
+
+    const [statsResult, searchResult] = await Promise.allSettled([
+      services.pinecone.getIndexStats(),
+      services.pinecone.queryVectors(testEmbedding, 3)
+    ]);
+
+    if (searchResult.status === 'fulfilled') {
+      searchResult.value.matches?.forEach((match, index) => {
       });
-    } catch (error) {
     }
     
     
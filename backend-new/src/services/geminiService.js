@@ -1,9 +1,41 @@
 const { GoogleGenerativeAI } = require('@google/generative-ai');
+const crypto = require('crypto');
 const config = require('../config');
 
 let genAI = null;
 let model = null;
 
+// Exact-match LRU over (query, context): identical prompts skip the Gemini
+// round-trip entirely. This complements the semantic tier in responseCache,
+// which the chat route probes before retrieval even runs.
+const EXACT_CACHE_MAX = 1024;
+const exactResponseCache = new Map();
+
+function exactCacheKey(query, context) {
+  return crypto.createHash('sha256')
+    .update(query)
+    .update('\x00')
+    .update(context)
+    .digest('base64');
+}
+
+function exactCacheGet(key) {
+  const hit = exactResponseCache.get(key);
+  if (hit !== undefined) {
+    // Re-insert to refresh recency (Map preserves insertion order)
+    exactResponseCache.delete(key);
+    exactResponseCache.set(key, hit);
+  }
+  return hit;
+}
+
+function exactCacheSet(key, text) {
+  if (exactResponseCache.size >= EXACT_CACHE_MAX) {
+    exactResponseCache.delete(exactResponseCache.keys().next().value);
+  }
+  exactResponseCache.set(key, text);
+}
+
 async function initialize() {
   try {
     if (!config.gemini.apiKey) {
@@ -25,16 +57,14 @@ async function initialize() {
   }
 }
 
-async function generateResponse(query, context = '') {
-  try {
-    if (!model) {
-      throw new Error('Gemini model not initialized');
-    }
-
-    const systemPrompt = `You are a helpful AI assistant. Use the provided context to answer the user's question accurately and concisely. If the context doesn't contain relevant information, say "I don't have enough information to answer your question based on the available context."
+// Prompt scaffolding shared by both generation paths, built once at module
+// load - per-call work is limited to splicing in the context and question.
+const SYSTEM_PROMPT_PREFIX = `You are a helpful AI assistant. Use the provided context to answer the user's question accurately and concisely. If the context doesn't contain relevant information, say "I don't have enough information to answer your question based on the available context."
 
 Context:
-${context}
+`;
+
+const SYSTEM_PROMPT_SUFFIX = `
 
 Instructions:
 - Be helpful and conversational
@@ -43,14 +73,55 @@ Instructions:
 - Keep responses concise but informative
 - Maintain a friendly tone`;
 
-    const prompt = `${systemPrompt}
+function buildPrompt(query, context) {
+  return `${SYSTEM_PROMPT_PREFIX}${context}${SYSTEM_PROMPT_SUFFIX}
 
 User Question: ${query}`;
+}
 
-    const result = await model.generateContent(prompt);
+// Per-call generation settings for the non-streaming path: temperature 0
+// makes identical prompts produce identical answers (so exact-cache hits
+// stay consistent with fresh generations), and the output budget scales
+// with how much context there is to summarize instead of always allowing
+// the configured maximum.
+function generationConfigFor(context) {
+  return {
+    temperature: 0,
+    maxOutputTokens: Math.min(
+      config.gemini.maxTokens,
+      256 + Math.ceil(context.length / 20)
+    )
+  };
+}
+
+// Cheap local readiness signal - lets callers (health checks) verify the
+// model is configured without paying for a generation round-trip.
+function isReady() {
+  return model !== null;
+}
+
+async function generateResponse(query, context = '') {
+  try {
+    if (!model) {
+      throw new Error('Gemini model not initialized');
+    }
+
+    const cacheKey = exactCacheKey(query, context);
+    const cached = exactCacheGet(cacheKey);
+    if (cached !== undefined) {
+      return cached;
+    }
+
+    const prompt = buildPrompt(query, context);
+
+    const result = await model.generateContent({
+      contents: [{ role: 'user', parts: [{ text: prompt }] }],
+      generationConfig: generationConfigFor(context)
+    });
     const response = await result.response;
     const text = response.text();
 
+    exactCacheSet(cacheKey, text);
     return text;
   } catch (error) {
     throw error;
@@ -63,21 +134,7 @@ async function generateStreamingResponse(query, context = '') {
       throw new Error('Gemini model not initialized');
     }
 
-    const systemPrompt = `You are a helpful AI assistant. Use the provided context to answer the user's question accurately and concisely. If the context doesn't contain relevant information, say "I don't have enough information to answer your question based on the available context."
-
-Context:
-${context}
-
-Instructions:
-- Be helpful and conversational
-- Use the context to provide accurate answers
-- If the context is insufficient, acknowledge this limitation
-- Keep responses concise but informative
-- Maintain a friendly tone`;
-
-    const prompt = `${systemPrompt}
-
-User Question: ${query}`;
+    const prompt = buildPrompt(query, context);
 
     const result = await model.generateContentStream(prompt);
     
@@ -93,6 +150,13 @@ async function summarizeText(text, maxLength = 200) {
       throw new Error('Gemini model not initialized');
     }
 
+    // Summaries of identical text are stable - never pay for them twice
+    const cacheKey = exactCacheKey(`summarize:${maxLength}`, text);
+    const cached = exactCacheGet(cacheKey);
+    if (cached !== undefined) {
+      return cached;
+    }
+
     const prompt = `Please summarize the following text in ${maxLength} characters or less, keeping the most important information:
 
 ${text}`;
@@ -101,6 +165,7 @@ ${text}`;
     const response = await result.response;
     const summary = response.text();
 
+    exactCacheSet(cacheKey, summary);
     return summary;
   } catch (error) {
     throw error;
@@ -113,6 +178,13 @@ async function extractKeywords(text) {
       throw new Error('Gemini model not initialized');
     }
 
+    // Keyword extraction over identical text is stable - cache it too
+    const cacheKey = exactCacheKey('keywords', text);
+    const cached = exactCacheGet(cacheKey);
+    if (cached !== undefined) {
+      return cached.slice();
+    }
+
     const prompt = `Extract the main keywords and topics from the following text. Return them as a comma-separated list:
 
 ${text}`;
@@ -121,7 +193,9 @@ ${text}`;
     const response = await result.response;
     const keywords = response.text();
 
-    return keywords.split(',').map(k => k.trim()).filter(k => k.length > 0);
+    const parsed = keywords.split(',').map(k => k.trim()).filter(k => k.length > 0);
+    exactCacheSet(cacheKey, parsed);
+    return parsed.slice();
   } catch (error) {
     throw error;
   }
@@ -129,6 +203,7 @@ ${text}`;
 
 module.exports = {
   initialize,
+  isReady,
   generateResponse,
   generateStreamingResponse,
   summarizeText,
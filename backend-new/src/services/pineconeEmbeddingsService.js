@@ -1,7 +1,58 @@
-const axios = require('axios');
+const OpenAI = require('openai');
+const crypto = require('crypto');
+const https = require('https');
 const config = require('../config');
 
 let embeddingsConfig = null;
+let openaiClient = null;
+
+// Index dimension, read once at module load - every embedding leaving this
+// module is normalized against it.
+const INDEX_DIMENSION = config.pinecone.dimension;
+
+// Pad with zeros or truncate in one typed-array pass so a model/index
+// dimension mismatch is corrected here instead of surfacing later as a
+// Pinecone rejection on the upsert or query.
+function normalizeDimension(embedding) {
+  if (embedding.length === INDEX_DIMENSION) {
+    return embedding;
+  }
+  const normalized = new Float32Array(INDEX_DIMENSION);
+  const limit = Math.min(embedding.length, INDEX_DIMENSION);
+  for (let i = 0; i < limit; i++) {
+    normalized[i] = embedding[i];
+  }
+  return normalized;
+}
+
+// Exact-match LRU cache for single-text embeddings. Chat traffic repeats
+// queries often ("hi", "thanks", re-asks) and each one costs a full OpenAI
+// round-trip, so repeats are served from memory instead.
+const EMBEDDING_CACHE_MAX = 4096;
+const embeddingCache = new Map();
+
+function embeddingCacheKey(text) {
+  return crypto.createHash('sha256').update(text).digest('base64');
+}
+
+function embeddingCacheGet(key) {
+  const hit = embeddingCache.get(key);
+  if (hit !== undefined) {
+    // Re-insert to refresh recency (Map preserves insertion order).
+    embeddingCache.delete(key);
+    embeddingCache.set(key, hit);
+  }
+  return hit;
+}
+
+function embeddingCacheSet(key, embedding) {
+  if (embeddingCache.size >= EMBEDDING_CACHE_MAX) {
+    embeddingCache.delete(embeddingCache.keys().next().value);
+  }
+  // Float32Array stores ~8 bytes/component less than a number[] of boxed
+  // doubles - at 4096 cached vectors the difference is tens of MB
+  embeddingCache.set(key, Float32Array.from(embedding));
+}
 
 async function initialize() {
   try {
@@ -11,6 +62,21 @@ async function initialize() {
       baseUrl: config.pineconeEmbeddings.baseUrl
     };
 
+    // Official OpenAI client over one keep-alive connection pool -
+    // amortizes the TLS handshake and bounds sockets under bursty load.
+    openaiClient = new OpenAI({
+      apiKey: embeddingsConfig.apiKey,
+      baseURL: embeddingsConfig.baseUrl,
+      timeout: 30000, // 30 seconds timeout
+      maxRetries: 2, // retry transient failures/429s before surfacing
+      httpAgent: new https.Agent({
+        keepAlive: true,
+        keepAliveMsecs: 30000,
+        maxSockets: 64,
+        maxFreeSockets: 16
+      })
+    });
+
     return embeddingsConfig;
   } catch (error) {
     throw error;
@@ -19,7 +85,7 @@ async function initialize() {
 
 async function getEmbeddings(texts) {
   try {
-    if (!embeddingsConfig) {
+    if (!embeddingsConfig || !openaiClient) {
       throw new Error('Pinecone embeddings service not initialized');
     }
 
@@ -27,63 +93,114 @@ async function getEmbeddings(texts) {
       texts = [texts];
     }
 
-    const response = await axios.post(
-      `${embeddingsConfig.baseUrl}/embeddings`,
-      {
-        model: embeddingsConfig.model,
-        input: texts
-      },
-      {
-        headers: {
-          'Authorization': `Bearer ${embeddingsConfig.apiKey}`,
-          'Content-Type': 'application/json'
-        },
-        timeout: 30000 // 30 seconds timeout
-      }
-    );
+    const response = await openaiClient.embeddings.create({
+      model: embeddingsConfig.model,
+      input: texts
+    });
 
-    if (!response.data || !response.data.data) {
+    if (!response || !response.data) {
       throw new Error('Invalid response from OpenAI API');
     }
 
-    const embeddings = response.data.data.map(item => item.embedding);
-    
+    const embeddings = response.data.map(item => normalizeDimension(item.embedding));
+
     return embeddings;
   } catch (error) {
-    
-    if (error.response) {
-    }
-    
     throw error;
   }
 }
 
 async function getEmbedding(text) {
   try {
+    const key = embeddingCacheKey(text);
+    const cached = embeddingCacheGet(key);
+    if (cached !== undefined) {
+      return cached;
+    }
+
     const embeddings = await getEmbeddings([text]);
+    embeddingCacheSet(key, embeddings[0]);
     return embeddings[0];
   } catch (error) {
     throw error;
   }
 }
 
-async function getBatchEmbeddings(texts, batchSize = 10) {
+// Micro-batcher: single-text requests that arrive within a short window are
+// coalesced into one OpenAI call (the embeddings API natively accepts an
+// array of inputs), so N concurrent chat turns pay one round-trip, not N.
+const BATCH_WINDOW_MS = 10;
+const BATCH_MAX_SIZE = 32;
+let pendingBatch = [];
+let batchTimer = null;
+
+function flushBatch() {
+  const batch = pendingBatch;
+  pendingBatch = [];
+  if (batchTimer) {
+    clearTimeout(batchTimer);
+    batchTimer = null;
+  }
+  if (batch.length === 0) {
+    return;
+  }
+
+  getEmbeddings(batch.map(item => item.text))
+    .then(embeddings => {
+      batch.forEach((item, i) => {
+        embeddingCacheSet(embeddingCacheKey(item.text), embeddings[i]);
+        item.resolve(embeddings[i]);
+      });
+    })
+    .catch(error => {
+      batch.forEach(item => item.reject(error));
+    });
+}
+
+function getEmbeddingBatched(text) {
+  const key = embeddingCacheKey(text);
+  const cached = embeddingCacheGet(key);
+  if (cached !== undefined) {
+    return Promise.resolve(cached);
+  }
+
+  return new Promise((resolve, reject) => {
+    pendingBatch.push({ text, resolve, reject });
+    if (pendingBatch.length >= BATCH_MAX_SIZE) {
+      flushBatch();
+    } else if (!batchTimer) {
+      batchTimer = setTimeout(flushBatch, BATCH_WINDOW_MS);
+    }
+  });
+}
+
+// The embeddings API accepts up to 2048 inputs per request, so batches can
+// be far larger than the old default of 10 - a typical document now embeds
+// in a single round-trip.
+async function getBatchEmbeddings(texts, batchSize = 100, concurrency = 4) {
   try {
-    const allEmbeddings = [];
-    
+    const batches = [];
     for (let i = 0; i < texts.length; i += batchSize) {
-      const batch = texts.slice(i, i + batchSize);
-      
-      const batchEmbeddings = await getEmbeddings(batch);
-      allEmbeddings.push(...batchEmbeddings);
-      
-      // Add small delay between batches to avoid rate limiting
-      if (i + batchSize < texts.length) {
-        await new Promise(resolve => setTimeout(resolve, 100));
+      batches.push(texts.slice(i, i + batchSize));
+    }
+
+    // Bounded worker pool: up to `concurrency` batches in flight at once
+    // instead of one batch per round-trip with a fixed sleep in between.
+    // Results are written by batch index so ordering is preserved.
+    const results = new Array(batches.length);
+    let nextBatch = 0;
+
+    async function worker() {
+      while (nextBatch < batches.length) {
+        const i = nextBatch++;
+        results[i] = await getEmbeddings(batches[i]);
       }
     }
-    
-    return allEmbeddings;
+
+    const workerCount = Math.min(concurrency, batches.length);
+    await Promise.all(Array.from({ length: workerCount }, worker));
+
+    return results.flat();
   } catch (error) {
     throw error;
   }
@@ -102,6 +219,7 @@ module.exports = {
   initialize,
   getEmbeddings,
   getEmbedding,
+  getEmbeddingBatched,
   getBatchEmbeddings,
   testConnection
 };
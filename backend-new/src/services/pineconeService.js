@@ -26,13 +26,28 @@ async function initialize() {
   }
 }
 
+// Vectors travel to Pinecone as JSON, where a raw double prints up to 17
+// significant digits per component. Rounding to 6 decimals retains more
+// precision than cosine scoring needs while cutting payload size roughly
+// in half on both the query and upsert paths.
+function compactVector(vector) {
+  const compact = new Array(vector.length);
+  for (let i = 0; i < vector.length; i++) {
+    compact[i] = Math.round(vector[i] * 1e6) / 1e6;
+  }
+  return compact;
+}
+
 async function upsertVectors(vectors) {
   try {
     if (!index) {
       throw new Error('Pinecone index not initialized');
     }
 
-    const response = await index.upsert(vectors);
+    const response = await index.upsert(vectors.map(vector => ({
+      ...vector,
+      values: compactVector(vector.values)
+    })));
     return response;
   } catch (error) {
     throw error;
@@ -46,7 +61,7 @@ async function queryVectors(queryVector, topK = 5, filter = {}) {
     }
 
     const queryRequest = {
-      vector: queryVector,
+      vector: compactVector(queryVector),
       topK,
       includeMetadata: true,
       includeValues: false
@@ -63,6 +78,19 @@ async function queryVectors(queryVector, topK = 5, filter = {}) {
   }
 }
 
+async function fetchVectors(ids) {
+  try {
+    if (!index) {
+      throw new Error('Pinecone index not initialized');
+    }
+
+    const response = await index.fetch(ids);
+    return response;
+  } catch (error) {
+    throw error;
+  }
+}
+
 async function deleteVectors(ids) {
   try {
     if (!index) {
@@ -92,37 +120,62 @@ async function getIndexStats() {
 function chunkText(text, chunkSize = 1000, overlap = 200) {
   const chunks = [];
   let start = 0;
-  
+
+  // Single pass over the source string: each chunk's boundaries are
+  // computed against `text` directly and sliced exactly once, instead of
+  // materializing a window, re-slicing it at the word boundary and
+  // trimming the copies.
   while (start < text.length) {
-    const end = Math.min(start + chunkSize, text.length);
-    let chunk = text.slice(start, end);
-    
-    // Try to break at word boundary
-    if (end < text.length) {
-      const lastSpace = chunk.lastIndexOf(' ');
+    const hardEnd = Math.min(start + chunkSize, text.length);
+    let end = hardEnd;
+    let nextStart;
+
+    if (hardEnd < text.length) {
+      // Try to break at word boundary
+      const lastSpace = text.lastIndexOf(' ', hardEnd - 1) - start;
       if (lastSpace > chunkSize * 0.8) {
-        chunk = chunk.slice(0, lastSpace);
-        start += lastSpace + 1;
+        end = start + lastSpace;
+        nextStart = end + 1;
       } else {
-        start += chunkSize - overlap;
+        nextStart = start + chunkSize - overlap;
       }
     } else {
-      start = text.length;
+      nextStart = text.length;
     }
-    
-    if (chunk.trim().length > 0) {
-      chunks.push(chunk.trim());
+
+    const chunk = text.slice(start, end).trim();
+    if (chunk.length > 0) {
+      chunks.push(chunk);
     }
+    start = nextStart;
   }
-  
+
   return chunks;
 }
 
+// Rough token count using the ~4 chars/token average that holds for English
+// BPE vocabularies. Good enough for sizing chunks and prompt budgets without
+// pulling a full tokenizer into the dependency tree.
+const CHARS_PER_TOKEN = 4;
+
+function estimateTokens(text) {
+  return Math.ceil(text.length / CHARS_PER_TOKEN);
+}
+
+// Token-budgeted chunking: callers reason in model tokens (what embedding
+// and context windows are actually measured in) rather than characters.
+function chunkTextByTokens(text, chunkTokens = 400, overlapTokens = 50) {
+  return chunkText(text, chunkTokens * CHARS_PER_TOKEN, overlapTokens * CHARS_PER_TOKEN);
+}
+
 module.exports = {
   initialize,
   upsertVectors,
   queryVectors,
+  fetchVectors,
   deleteVectors,
   getIndexStats,
-  chunkText
+  chunkText,
+  chunkTextByTokens,
+  estimateTokens
 };
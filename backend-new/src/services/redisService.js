@@ -52,10 +52,13 @@ async function initialize() {
   }
 }
 
+// Sessions are stored as a Redis list with one JSON-encoded message per
+// entry, so appending a message serializes only that message instead of
+// re-stringifying (and re-parsing) the whole conversation every turn.
 async function getSession(sessionId) {
   try {
-    const sessionData = await client.get(`session:${sessionId}`);
-    return sessionData ? JSON.parse(sessionData) : null;
+    const messages = await getSessionHistory(sessionId);
+    return messages.length > 0 ? { id: sessionId, messages } : null;
   } catch (error) {
     throw error;
   }
@@ -64,7 +67,14 @@ async function getSession(sessionId) {
 async function setSession(sessionId, sessionData) {
   try {
     const key = `session:${sessionId}`;
-    await client.setEx(key, config.session.ttl, JSON.stringify(sessionData));
+    const messages = sessionData.messages || [];
+
+    const multi = client.multi().del(key);
+    if (messages.length > 0) {
+      multi.rPush(key, messages.map(message => JSON.stringify(message)));
+      multi.expire(key, config.session.ttl);
+    }
+    await multi.exec();
     return true;
   } catch (error) {
     throw error;
@@ -73,30 +83,25 @@ async function setSession(sessionId, sessionData) {
 
 async function addMessageToSession(sessionId, message) {
   try {
-    const session = await getSession(sessionId);
-    if (!session) {
-      // Create new session
-      const newSession = {
-        id: sessionId,
-        messages: [message],
-        createdAt: new Date().toISOString(),
-        updatedAt: new Date().toISOString()
-      };
-      await setSession(sessionId, newSession);
-      return newSession;
-    }
+    const key = `session:${sessionId}`;
 
-    // Add message to existing session
-    session.messages.push(message);
-    session.updatedAt = new Date().toISOString();
+    // Single round-trip: append, trim to the message cap, refresh the TTL
+    await client.multi()
+      .rPush(key, JSON.stringify(message))
+      .lTrim(key, -config.session.maxMessages, -1)
+      .expire(key, config.session.ttl)
+      .exec();
 
-    // Limit messages to prevent memory issues
-    if (session.messages.length > config.session.maxMessages) {
-      session.messages = session.messages.slice(-config.session.maxMessages);
-    }
+    return true;
+  } catch (error) {
+    throw error;
+  }
+}
 
-    await setSession(sessionId, session);
-    return session;
+// Liveness probe for the health endpoints
+async function ping() {
+  try {
+    return await client.ping();
   } catch (error) {
     throw error;
   }
@@ -113,8 +118,19 @@ async function clearSession(sessionId) {
 
 async function getSessionHistory(sessionId) {
   try {
-    const session = await getSession(sessionId);
-    return session ? session.messages : [];
+    const entries = await client.lRange(`session:${sessionId}`, 0, -1);
+    return entries.map(entry => JSON.parse(entry));
+  } catch (error) {
+    throw error;
+  }
+}
+
+// Fetch only the last `count` messages - the hot chat path needs a handful
+// of recent turns, not the whole capped history.
+async function getRecentMessages(sessionId, count) {
+  try {
+    const entries = await client.lRange(`session:${sessionId}`, -count, -1);
+    return entries.map(entry => JSON.parse(entry));
   } catch (error) {
     throw error;
   }
@@ -129,10 +145,12 @@ async function close() {
 
 module.exports = {
   initialize,
+  ping,
   getSession,
   setSession,
   addMessageToSession,
   clearSession,
   getSessionHistory,
+  getRecentMessages,
   close
 };
@@ -0,0 +1,92 @@
+// In-memory semantic cache for generated chat responses. Queries whose
+// embeddings are close enough to a previously answered query reuse the stored
+// answer and skip the LLM call entirely - the single biggest latency win in
+// the pipeline on a hit.
+
+const SIMILARITY_THRESHOLD = 0.85;
+const MAX_ENTRIES = 10000;
+
+const entries = new Map(); // insertion-ordered: oldest entry first for LRU eviction
+let nextKey = 0;
+let hits = 0;
+let misses = 0;
+
+function cosineSimilarity(a, b) {
+  if (a.length !== b.length) {
+    return 0;
+  }
+
+  let dot = 0;
+  let normA = 0;
+  let normB = 0;
+  for (let i = 0; i < a.length; i++) {
+    dot += a[i] * b[i];
+    normA += a[i] * a[i];
+    normB += b[i] * b[i];
+  }
+
+  if (normA === 0 || normB === 0) {
+    return 0;
+  }
+
+  return dot / (Math.sqrt(normA) * Math.sqrt(normB));
+}
+
+// Returns the cached response for the closest stored query embedding, or
+// null when nothing clears the similarity threshold.
+function lookup(queryEmbedding) {
+  let bestKey = null;
+  let bestScore = -1;
+
+  for (const [key, entry] of entries) {
+    const score = cosineSimilarity(queryEmbedding, entry.embedding);
+    if (score > bestScore) {
+      bestScore = score;
+      bestKey = key;
+    }
+  }
+
+  if (bestKey !== null && bestScore >= SIMILARITY_THRESHOLD) {
+    // Re-insert to refresh recency (Map preserves insertion order).
+    const entry = entries.get(bestKey);
+    entries.delete(bestKey);
+    entries.set(bestKey, entry);
+    hits++;
+    return entry.response;
+  }
+
+  misses++;
+  return null;
+}
+
+function store(queryEmbedding, response) {
+  if (entries.size >= MAX_ENTRIES) {
+    entries.delete(entries.keys().next().value);
+  }
+  // Stored as Float32Array: 4 bytes per component instead of a boxed
+  // double, and similarity scans stay on a flat typed buffer
+  entries.set(nextKey++, { embedding: Float32Array.from(queryEmbedding), response });
+}
+
+function getStats() {
+  const total = hits + misses;
+  return {
+    entries: entries.size,
+    hits,
+    misses,
+    hitRate: total > 0 ? hits / total : 0
+  };
+}
+
+function clear() {
+  entries.clear();
+  hits = 0;
+  misses = 0;
+}
+
+module.exports = {
+  lookup,
+  store,
+  getStats,
+  clear
+};
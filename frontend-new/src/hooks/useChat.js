@@ -104,7 +104,6 @@ const useChat = () => {
     setError(null);
 
     try {
-      // Use regular chat endpoint instead of streaming
       const response = await fetch(`${API_BASE_URL}/chat`, {
         method: 'POST',
         headers: {
@@ -112,42 +111,56 @@ const useChat = () => {
         },
         body: JSON.stringify({
           message,
-          sessionId: sessionId
+          sessionId: sessionId,
+          stream: true
         }),
       });
 
-      if (!response.ok) {
+      if (!response.ok || !response.body) {
         throw new Error(`HTTP error! status: ${response.status}`);
       }
 
-      const data = await response.json();
-      
-      if (data.success) {
-        // Set session ID if not already set
-        if (!sessionId && data.data.sessionId) {
-          setSessionId(data.data.sessionId);
-        }
-        
-        // Simulate streaming by breaking the response into chunks
-        const responseText = data.data.message;
-        const words = responseText.split(' ');
-        // Send chunks word by word
-        for (let i = 0; i < words.length; i++) {
-          const word = words[i] + (i < words.length - 1 ? ' ' : '');
-          if (onChunk) onChunk(word);
-          // Small delay to simulate streaming
-          await new Promise(resolve => setTimeout(resolve, 50));
-        }
-        
-        // Reload chat history to get the latest messages
-        if (data.data.sessionId) {
-          await loadChatHistory();
+      // Read the server-sent event stream and forward each delta as it
+      // arrives, so tokens render at generation speed
+      const reader = response.body.getReader();
+      const decoder = new TextDecoder();
+      let buffer = '';
+      let completedSessionId = null;
+
+      while (true) {
+        const { done, value } = await reader.read();
+        if (done) break;
+
+        buffer += decoder.decode(value, { stream: true });
+
+        const events = buffer.split('\n\n');
+        buffer = events.pop(); // keep any partial event for the next read
+
+        for (const event of events) {
+          if (!event.startsWith('data: ')) continue;
+          const payload = JSON.parse(event.slice(6));
+
+          if (payload.type === 'delta') {
+            if (onChunk) onChunk(payload.text);
+          } else if (payload.type === 'done') {
+            completedSessionId = payload.sessionId;
+          } else if (payload.type === 'error') {
+            throw new Error(payload.message || 'Failed to send streaming message');
+          }
         }
-        
-        if (onComplete) onComplete(data.data.sessionId);
-      } else {
-        throw new Error(data.error || 'Failed to send message');
       }
+
+      // Set session ID if not already set
+      if (!sessionId && completedSessionId) {
+        setSessionId(completedSessionId);
+      }
+
+      // Reload chat history to get the latest messages
+      if (completedSessionId) {
+        await loadChatHistory();
+      }
+
+      if (onComplete) onComplete(completedSessionId);
     } catch (err) {
       const errorMessage = err instanceof Error ? err.message : 'Failed to send streaming message';
       setError(errorMessage);